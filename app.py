@@ -8,6 +8,7 @@ if script_dir not in sys.path:
 
 import gradio as gr
 import generator
+import drift_monitor
 
 # Get the list of loot tables once, when the app starts.
 available_tables = generator.get_available_loot_tables()
@@ -15,8 +16,25 @@ available_tables = generator.get_available_loot_tables()
 LOG_DIR = 'logs'
 LOG_FILE = os.path.join(LOG_DIR, 'treasure.csv')
 
+# Set to True to compare live generation against each loot table as it was when first used.
+# Drift warnings are printed to the console.
+ENABLE_DRIFT_MONITOR = False
+drift_monitors = {}
+
+def get_drift_monitor(loot_table_filename):
+    """
+    Returns the drift monitor for a loot table, creating it on first use.
+    """
+    if not ENABLE_DRIFT_MONITOR:
+        return None
+    monitor = drift_monitors.get(loot_table_filename)
+    if monitor is None:
+        reference_table = generator.load_loot_tables(loot_table_filename)
+        monitor = drift_monitors.setdefault(loot_table_filename, drift_monitor.DriftMonitor(reference_table))
+    return monitor
+
 def generate_loot_wrapper(loot_table_filename, character_level, mode):
-    loot_generator = generator.LootGenerator(loot_table_filename, character_level)
+    loot_generator = generator.LootGenerator(loot_table_filename, character_level, monitor=get_drift_monitor(loot_table_filename))
     loot_generator.generate(mode)
     return (
         loot_generator.get_user_friendly_log(),
@@ -86,7 +104,7 @@ with gr.Blocks(css=css) as demo:
         )
 
     mode_selection = gr.Radio(
-        ["Full", "Force Normal Treasure", "Force Advanced Treasure", "Force Perishable", "Gem Type", "Monstrous Body Part Type"],
+        generator.GENERATION_MODES,
         label="Generation Mode",
         value="Full"
     )
@@ -0,0 +1,581 @@
+import math
+import threading
+from typing import Optional, Dict, Any, List, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from generator import LootGenerator
+
+# Expected count below which chi-square categories are pooled together.
+MIN_EXPECTED_COUNT = 5.0
+
+# Stages whose outcomes are checked against the reference loot table.
+STAGE_NAMES = {
+    "primary": "Primary Treasure",
+    "advanced": "Advanced Treasure Type",
+    "item_type": "Base Item Type",
+    "base_item": "Base Item",
+    "prefix_type": "Prefix Type",
+    "suffix_type": "Suffix Type",
+    "gem": "Gem Type",
+    "body_part": "Monstrous Body Part",
+    "cursed_rate": "Cursed Rate",
+    "gold": "Normal Treasure Gold",
+    "prefix_gp": "Prefix GP",
+    "prefix_xp": "Prefix XP",
+    "suffix_gp": "Suffix GP",
+    "suffix_xp": "Suffix XP",
+    "base_item_value": "Base Item Value",
+    "table_config": "Table Roll Parameters",
+}
+
+# Value stages tested statistically, each with its own tally.
+VALUE_STAGES = ("gold", "prefix_gp", "prefix_xp", "suffix_gp", "suffix_xp")
+
+# Alerts that compare fixed values rather than test counts; they are re-printed only when their detail changes.
+EXACT_STAGES = ("base_item_value", "table_config")
+
+# Stages whose expected outcomes depend on the set level, through an add_level key in the reference table.
+LEVEL_STAGES = ("primary", "advanced", "base_item")
+
+# Keys that control how a table is rolled rather than what it contains.
+ROLL_PARAMETER_KEYS = ('die_size', 'add_level', 'mod', 'mult_level', 'ps_die_size', 'ps_mod', 'use_prefix', 'use_suffix')
+
+
+# Upper tail probability of the chi-square distribution, via the regularized incomplete gamma function.
+def chi_square_sf(statistic: float, df: int) -> float:
+    if statistic <= 0:
+        return 1.0
+    a = df / 2.0
+    x = statistic / 2.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        # Series expansion of the lower incomplete gamma function.
+        term = 1.0 / a
+        total = term
+        n = a
+        for _ in range(500):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    # Continued fraction (modified Lentz) for the upper incomplete gamma function.
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 500):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        if abs(d) < tiny:
+            d = tiny
+        c = b + an / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+# Probability of each entry key being matched by a 1d(die_size) + mod roll; None collects rolls no entry covers.
+def roll_distribution(entries: Iterable[tuple[str, Any]], die_size: int, mod: int) -> Dict[Optional[str], float]:
+    ranges = [
+        (key, data['min'], data['max'])
+        for key, data in entries
+        if isinstance(data, dict) and data.get('min') is not None and data.get('max') is not None
+    ]
+    counts: Dict[Optional[str], int] = {}
+    for roll in range(1, die_size + 1):
+        value = roll + mod
+        matched = None
+        for key, min_val, max_val in ranges:
+            if min_val <= value <= max_val:
+                matched = key
+                break
+        counts[matched] = counts.get(matched, 0) + 1
+    return {key: count / die_size for key, count in counts.items()}
+
+
+# Flatten every roll parameter in a loot table into {"path.to.entry.key": value} for comparison.
+def roll_parameters(loot_table: Dict[str, Any]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+
+    def collect(path: str, data: Any) -> None:
+        if isinstance(data, dict):
+            for key in ROLL_PARAMETER_KEYS:
+                if key in data:
+                    params[f"{path}.{key}"] = data[key]
+
+    tables = loot_table.get('loot_tables', {})
+    for table_name in ('primary_treasure_roll', 'advanced_treasure_roll', 'base_item_type'):
+        table = tables.get(table_name, {})
+        collect(f"loot_tables.{table_name}", table)
+        for entry_key, entry_data in table.get('type', {}).items():
+            collect(f"loot_tables.{table_name}.type.{entry_key}", entry_data)
+    for table_name in ('gems', 'monstrous_body_part'):
+        collect(table_name, loot_table.get(table_name, {}))
+    for table_name in ('prefixes_type', 'suffixes_type'):
+        for entry_key, entry_data in loot_table.get('modifiers', {}).get(table_name, {}).items():
+            collect(f"modifiers.{table_name}.{entry_key}", entry_data)
+    return params
+
+
+# Mean and variance of the xp and gp of whichever entry a 1d(die_size) + mod roll matches.
+def value_moments(entries: Dict[str, Any], die_size: int, mod: int) -> tuple[float, float, float, float]:
+    gp_mean = gp_square = xp_mean = xp_square = 0.0
+    for key, p in roll_distribution(entries.items(), die_size, mod).items():
+        if key is None:
+            continue
+        gp = entries[key].get('gp', 0)
+        xp = entries[key].get('xp', 0)
+        gp_mean += p * gp
+        gp_square += p * gp * gp
+        xp_mean += p * xp
+        xp_square += p * xp * xp
+    return gp_mean, gp_square - gp_mean ** 2, xp_mean, xp_square - xp_mean ** 2
+
+
+# Running sums comparing an observed numeric stream with its expected mean and variance under the reference table.
+class ValueTally:
+    def __init__(self):
+        self.count: int = 0
+        self.observed: float = 0.0
+        self.expected: float = 0.0
+        self.variance: float = 0.0
+
+    def add(self, observed: float, mean: float, variance: float) -> None:
+        self.count += 1
+        self.observed += observed
+        self.expected += mean
+        self.variance += variance
+
+    def test(self) -> Optional[tuple[float, float, str]]:
+        """
+        z-test of the observed total against the expected total.
+        Returns (statistic, p_value, detail) or None if there is nothing to test.
+        """
+        if self.count == 0:
+            return None
+        deviation = self.observed - self.expected
+        detail = f"observed mean {self.observed / self.count:.1f}, expected {self.expected / self.count:.1f}"
+        if self.variance <= 1e-9:
+            # Every value was fixed by the reference table, so any difference is a table edit.
+            if abs(deviation) <= 1e-6 * max(1.0, abs(self.expected)):
+                return None
+            return math.inf, 0.0, detail
+        statistic = deviation ** 2 / self.variance
+        return statistic, chi_square_sf(statistic, 1), detail
+
+    def __repr__(self) -> str:
+        return f"<ValueTally count={self.count}, observed={self.observed:.1f}, expected={self.expected:.1f}>"
+
+
+# A single significant deviation between observed and expected outcomes.
+class DriftAlert:
+    def __init__(self, stage: str, group: tuple, p_value: float, statistic: float, observed: int, detail: str):
+        self.stage: str = stage
+        self.group: tuple = group # Table keys the stage was rolled under, e.g. the base item category
+        self.p_value: float = p_value
+        self.statistic: float = statistic
+        self.observed: int = observed # Number of observations the test was based on
+        self.detail: str = detail
+
+    def __str__(self) -> str:
+        stage_name = STAGE_NAMES.get(self.stage, self.stage)
+        if self.group:
+            stage_name += f" ({', '.join(str(key) for key in self.group)})"
+        return f"{stage_name}: p={self.p_value:.3g} over {self.observed} observations ({self.detail})"
+
+    @property
+    def signature(self) -> tuple:
+        # Identifies an alert across checks; exact alerts also change identity when their values change.
+        return self.stage, self.group, self.detail if self.stage in EXACT_STAGES else None
+
+    def __repr__(self) -> str:
+        return f"<DriftAlert stage='{self.stage}', group={self.group}, p_value={self.p_value:.3g}>"
+
+
+class DriftMonitor:
+    """
+    Opt-in streaming statistics for LootGenerator.generate.
+
+    Counts the outcome of every table lookup per stage and table group (e.g. per base item category), and
+    every check_interval generated items compares the counts against the probabilities the reference loot
+    table gives at the levels that were used, using chi-square goodness-of-fit tests. The cursed rate,
+    normal treasure gold and prefix/suffix GP/XP are tested the same way. Base item GP/XP and the live
+    table's roll parameters (die_size, add_level, mod, ps_die_size, ...) are fixed by the table, so they
+    are compared with the reference exactly.
+
+    Each check tests only the items recorded since the previous check and then starts a new window, so
+    repeated checks do not keep re-testing the same data. A warning is printed only for alerts that were
+    not raised by the previous check, or whose exact values changed.
+
+    Only the generator's set level and matched table keys are recorded; every die size and modifier comes
+    from the reference table, so an edit to either shows up as drift. Memory grows with the size of the
+    loot table and the number of distinct levels used, not with the number of items generated.
+    """
+
+    def __init__(self, loot_table: Dict[str, Any], check_interval: int = 1000, alpha: float = 0.001):
+        self.loot_table = loot_table
+        self.check_interval = check_interval
+        self.alpha = alpha
+        self.items_seen: int = 0
+        self.alerts: List[DriftAlert] = [] # Alerts raised by the most recent check
+        self.new_alerts: List[DriftAlert] = [] # Alerts from the most recent check that the one before it did not raise
+        self._reference_parameters = roll_parameters(loot_table)
+        self._expected: Dict[tuple[str, tuple, Optional[int]], Dict[Optional[str], float]] = {}
+        self._value_moments: Dict[tuple, Optional[tuple]] = {}
+        self._lock = threading.Lock()
+        self._mode_counts: Dict[str, int] = {}
+        self._live_table: Optional[Dict[str, Any]] = None # Most recently generated-from table, checked against the reference
+        self._previous_signatures: set = set()
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._window_items: int = 0
+        self._counts: Dict[tuple[str, tuple], Dict[Optional[str], int]] = {}
+        self._levels: Dict[tuple[str, tuple], Dict[Optional[int], int]] = {}
+        self._tallies: Dict[str, ValueTally] = {stage: ValueTally() for stage in VALUE_STAGES}
+        self._base_item_mismatches: Dict[tuple[str, str], tuple[int, str]] = {} # (category, item) -> (rolls, detail)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.items_seen = 0
+            self.alerts = []
+            self.new_alerts = []
+            self._previous_signatures = set()
+            self._mode_counts = {}
+            self._live_table = None
+            self._reset_window()
+
+    def record(self, loot_generator: 'LootGenerator', mode: str) -> None:
+        level = loot_generator.set_level
+        total_gold = None
+        value_entries: Dict[str, Dict[str, Any]] = {}
+        for entry in loot_generator.results_log:
+            if entry['description'] == "Total Gold":
+                total_gold = entry['value']
+            elif "effect" in entry:
+                value_entries[entry['description']] = entry
+
+        with self._lock:
+            self.items_seen += 1
+            self._window_items += 1
+            self._mode_counts[mode] = self._mode_counts.get(mode, 0) + 1
+            self._live_table = loot_generator.loot_table
+
+            for stage, group, outcome in loot_generator.stage_outcomes:
+                key = (stage, group)
+                counts = self._counts.get(key)
+                if counts is None:
+                    counts = self._counts[key] = {}
+                    self._levels[key] = {}
+                counts[outcome] = counts.get(outcome, 0) + 1
+                condition = level if stage in LEVEL_STAGES else None
+                levels = self._levels[key]
+                levels[condition] = levels.get(condition, 0) + 1
+
+                if outcome is None:
+                    continue
+                if stage == "base_item":
+                    self._compare_base_item(group[0], outcome, value_entries.get("Base Item"))
+                elif stage in ("prefix_type", "suffix_type"):
+                    moments = self._affix_moments(stage, outcome, group[0], level)
+                    affix_kind = "prefix" if stage == "prefix_type" else "suffix"
+                    self._add_affix_values(affix_kind, value_entries.get(affix_kind.capitalize()), moments)
+
+            if total_gold is not None:
+                gold_moments = self._gold_moments(level)
+                if gold_moments is not None:
+                    self._tallies["gold"].add(total_gold, *gold_moments)
+
+            run_check = self.check_interval > 0 and self.items_seen % self.check_interval == 0
+
+        if run_check:
+            self.check()
+            for alert in self.new_alerts:
+                print(f"Warning: loot distribution drift detected - {alert}")
+
+    def _compare_base_item(self, category: str, item_key: str, entry: Optional[Dict[str, Any]]) -> None:
+        # A base item's xp and gp are fixed by its table entry, so any difference from the reference is an edit.
+        reference = self._cached_moments(("base_item", category, item_key), lambda: self._base_item_values(category, item_key))
+        if reference is None or entry is None:
+            # Not in the reference table; the categorical test already reports it.
+            return
+        live = (entry.get('gp', 0), entry.get('xp', 0))
+        if live == reference:
+            return
+        key = (category, item_key)
+        rolls = self._base_item_mismatches.get(key, (0, ""))[0] + 1
+        detail = f"gp {reference[0]} -> {live[0]}, xp {reference[1]} -> {live[1]}"
+        self._base_item_mismatches[key] = (rolls, detail)
+
+    def _base_item_values(self, category: str, item_key: str) -> tuple[Any, Any]:
+        item = self.loot_table['loot_tables']['base_items'][category][item_key]
+        return item.get('gp', 0), item.get('xp', 0)
+
+    def _add_affix_values(self, affix_kind: str, entry: Optional[Dict[str, Any]], moments: Optional[tuple[float, float, float, float]]) -> None:
+        if moments is None:
+            # Not in the reference table; the categorical test already reports it.
+            return
+        gp_mean, gp_variance, xp_mean, xp_variance = moments
+        self._tallies[f"{affix_kind}_gp"].add(entry.get('gp', 0) if entry else 0, gp_mean, gp_variance)
+        self._tallies[f"{affix_kind}_xp"].add(entry.get('xp', 0) if entry else 0, xp_mean, xp_variance)
+
+    def _cached_moments(self, key: tuple, compute) -> Optional[tuple]:
+        if key not in self._value_moments:
+            try:
+                self._value_moments[key] = compute()
+            except (KeyError, TypeError, ValueError, ZeroDivisionError):
+                self._value_moments[key] = None
+        return self._value_moments[key]
+
+    def _gold_moments(self, level: int) -> Optional[tuple[float, float]]:
+        # Mirrors LootGenerator.normal_treasure_roller using the reference normal_treasure entry.
+        def compute():
+            normal_treasure = self.loot_table['loot_tables']['primary_treasure_roll']['type']['normal_treasure']
+            die_size = normal_treasure['die_size']
+            factor = level if normal_treasure.get('mult_level', False) is True else 1
+            mean = (die_size + 1) / 2 * factor + normal_treasure.get('mod', 0)
+            return mean, (die_size * die_size - 1) / 12 * factor * factor
+
+        return self._cached_moments(("gold", level), compute)
+
+    def _affix_moments(self, stage: str, affix_type_key: str, item_type_key: str, level: int) -> Optional[tuple[float, float, float, float]]:
+        # Mirrors how LootGenerator.affix_type_roller picks the die and modifier for LootGenerator.affix_roller.
+        def compute():
+            affix_kind = 'prefixes' if stage == 'prefix_type' else 'suffixes'
+            affix_type = self.loot_table['modifiers'][f'{affix_kind}_type'][affix_type_key]
+            item_type = self.loot_table['loot_tables']['base_item_type']['type'][item_type_key]
+            if affix_type['name'].lower() == 'cursed':
+                die_size, mod = item_type['ps_die_size'], item_type['ps_mod']
+            else:
+                die_size = affix_type['die_size']
+                mod = level if affix_type.get('add_level', False) else 0
+            if die_size == 0:
+                die_size, mod = item_type['ps_die_size'], item_type['ps_mod']
+            return value_moments(self.loot_table['modifiers'][affix_kind][affix_type_key], die_size, mod)
+
+        key = (stage, affix_type_key, item_type_key, level)
+        return self._cached_moments(key, compute)
+
+    def expected_distribution(self, stage: str, group: tuple, level: Optional[int]) -> Dict[Optional[str], float]:
+        key = (stage, group, level)
+        expected = self._expected.get(key)
+        if expected is None:
+            try:
+                expected = self._compute_expected(stage, group, level)
+            except (KeyError, TypeError, ValueError, ZeroDivisionError):
+                # The reference table has no such stage/group, so every observation is unexpected.
+                expected = {}
+            self._expected[key] = expected
+        return expected
+
+    def _compute_expected(self, stage: str, group: tuple, level: Optional[int]) -> Dict[Optional[str], float]:
+        tables = self.loot_table['loot_tables']
+        if stage == "primary":
+            data = tables['primary_treasure_roll']
+            mod = level if data.get('add_level', False) is True else 0
+            return roll_distribution(data['type'].items(), data['die_size'], mod)
+        if stage == "advanced":
+            data = tables['advanced_treasure_roll']
+            mod = level if data.get('add_level', False) else 0
+            return roll_distribution(data['type'].items(), data['die_size'], mod)
+        if stage == "item_type":
+            die_size = tables['advanced_treasure_roll']['type'][group[0]]['die_size']
+            return roll_distribution(tables['base_item_type']['type'].items(), die_size, 0)
+        if stage == "base_item":
+            item_type = tables['base_item_type']['type'][group[0]]
+            mod = level if item_type.get('add_level') else 0
+            return roll_distribution(tables['base_items'][group[0]].items(), item_type['die_size'], mod)
+        if stage == "gem":
+            return roll_distribution(self.loot_table['gems'].items(), self.loot_table['gems']['die_size'], 0)
+        if stage == "body_part":
+            body_parts = self.loot_table['monstrous_body_part']
+            return roll_distribution(body_parts.items(), body_parts['die_size'], 0)
+        if stage in ("prefix_type", "suffix_type"):
+            return self._affix_type_distribution(stage, group[0])
+        raise ValueError(f"Unknown stage '{stage}'.")
+
+    def _affix_type_distribution(self, stage: str, item_type_key: str) -> Dict[Optional[str], float]:
+        # Mirrors LootGenerator.affix_type_roller: a capricious result rerolls with its own die_size and add_level.
+        affix_table = self.loot_table['modifiers'][f"{'prefixes' if stage == 'prefix_type' else 'suffixes'}_type"]
+        item_type = self.loot_table['loot_tables']['base_item_type']['type'][item_type_key]
+        die_size, mod = item_type['ps_die_size'], item_type['ps_mod']
+        result: Dict[Optional[str], float] = {}
+        mass = 1.0
+        for _ in range(64):
+            capricious_key = None
+            for key, p in roll_distribution(affix_table.items(), die_size, mod).items():
+                if key is not None and affix_table[key]['name'].lower() == 'capricious':
+                    capricious_key = key
+                    capricious_p = p
+                else:
+                    result[key] = result.get(key, 0.0) + mass * p
+            if capricious_key is None:
+                break
+            mass *= capricious_p
+            if mass < 1e-12:
+                break
+            die_size = affix_table[capricious_key]['die_size']
+            mod = affix_table[capricious_key]['add_level']
+        return result
+
+    def _is_cursed(self, stage: str, outcome: Optional[str]) -> bool:
+        if outcome is None:
+            return False
+        affix_table = self.loot_table['modifiers'].get(f"{'prefixes' if stage == 'prefix_type' else 'suffixes'}_type", {})
+        entry = affix_table.get(outcome)
+        return entry is not None and entry.get('name', '').lower() == 'cursed'
+
+    def _expected_counts(self, stage: str, group: tuple) -> Dict[Optional[str], float]:
+        # Counts are pooled across levels, so the expectation is the level-weighted mix of per-level distributions.
+        expected: Dict[Optional[str], float] = {}
+        for level, count in self._levels[(stage, group)].items():
+            for outcome, p in self.expected_distribution(stage, group, level).items():
+                expected[outcome] = expected.get(outcome, 0.0) + count * p
+        return expected
+
+    def _test_counts(self, counts: Dict[Optional[str], int], expected: Dict[Optional[str], float]) -> Optional[tuple[float, float, int, str]]:
+        """
+        Chi-square goodness-of-fit test of observed against expected counts for one stage/group.
+        Returns (statistic, p_value, observations, detail) or None if there is too little data to test.
+        """
+        total = sum(counts.values())
+
+        impossible = [key for key, count in counts.items() if count and expected.get(key, 0.0) <= 0.0]
+        if impossible:
+            return math.inf, 0.0, total, f"outcomes not possible in reference table: {impossible}"
+
+        bins: List[tuple[float, int, str]] = sorted(
+            (exp_count, counts.get(key, 0), key if key is not None else "out of range")
+            for key, exp_count in expected.items() if exp_count > 0
+        )
+        # Pool rare categories so every bin meets the minimum expected count.
+        pooled_expected = 0.0
+        pooled_observed = 0
+        while bins and (bins[0][0] < MIN_EXPECTED_COUNT or 0 < pooled_expected < MIN_EXPECTED_COUNT):
+            exp_count, obs_count, _ = bins.pop(0)
+            pooled_expected += exp_count
+            pooled_observed += obs_count
+        if pooled_expected > 0:
+            bins.append((pooled_expected, pooled_observed, "pooled rare outcomes"))
+
+        if len(bins) < 2 or pooled_expected and pooled_expected < MIN_EXPECTED_COUNT:
+            return None
+
+        statistic = sum((obs_count - exp_count) ** 2 / exp_count for exp_count, obs_count, _ in bins)
+        p_value = chi_square_sf(statistic, len(bins) - 1)
+        worst = max(bins, key=lambda b: (b[1] - b[0]) ** 2 / b[0])
+        detail = f"largest deviation '{worst[2]}': observed {worst[1]}, expected {worst[0]:.1f}"
+        return statistic, p_value, total, detail
+
+    def _table_config_alert(self) -> Optional[DriftAlert]:
+        if self._live_table is None:
+            return None
+        live_parameters = roll_parameters(self._live_table)
+        changed = sorted(
+            path for path in set(self._reference_parameters) | set(live_parameters)
+            if self._reference_parameters.get(path) != live_parameters.get(path)
+        )
+        if not changed:
+            return None
+        changes = [f"{path}: {self._reference_parameters.get(path)} -> {live_parameters.get(path)}" for path in changed[:5]]
+        if len(changed) > 5:
+            changes.append(f"and {len(changed) - 5} more")
+        return DriftAlert("table_config", (), 0.0, math.inf, self._window_items, "; ".join(changes))
+
+    def check(self) -> List[DriftAlert]:
+        """
+        Tests every stage/group, the cursed rate and GP/XP recorded since the previous check against the
+        reference table, compares the live table's roll parameters with the reference, then starts a new
+        window. Uses a Bonferroni correction across the statistical tests of a single check.
+        Returns every alert raised; new_alerts holds the ones the previous check did not raise.
+        """
+        with self._lock:
+            results = []
+            cursed_observed = 0
+            cursed_expected = 0.0
+            cursed_variance = 0.0
+            affix_rolls = 0
+            for (stage, group), counts in self._counts.items():
+                expected = self._expected_counts(stage, group)
+                tested = self._test_counts(counts, expected)
+                if tested is not None:
+                    statistic, p_value, observed, detail = tested
+                    results.append((stage, group, statistic, p_value, observed, detail))
+
+                if stage in ("prefix_type", "suffix_type"):
+                    affix_rolls += sum(counts.values())
+                    cursed_observed += sum(count for outcome, count in counts.items() if self._is_cursed(stage, outcome))
+                    for level, count in self._levels[(stage, group)].items():
+                        distribution = self.expected_distribution(stage, group, level)
+                        p_cursed = sum(p for outcome, p in distribution.items() if self._is_cursed(stage, outcome))
+                        cursed_expected += count * p_cursed
+                        cursed_variance += count * p_cursed * (1 - p_cursed)
+
+            if cursed_variance > 0:
+                statistic = (cursed_observed - cursed_expected) ** 2 / cursed_variance
+                detail = f"observed {cursed_observed} cursed, expected {cursed_expected:.1f}"
+                results.append(("cursed_rate", (), statistic, chi_square_sf(statistic, 1), affix_rolls, detail))
+
+            for stage, tally in self._tallies.items():
+                tested = tally.test()
+                if tested is not None:
+                    statistic, p_value, detail = tested
+                    results.append((stage, (), statistic, p_value, tally.count, detail))
+
+            threshold = self.alpha / len(results) if results else self.alpha
+            self.alerts = [
+                DriftAlert(stage, group, p_value, statistic, observed, detail)
+                for stage, group, statistic, p_value, observed, detail in results
+                if p_value < threshold
+            ]
+            for (category, item_key), (rolls, detail) in self._base_item_mismatches.items():
+                self.alerts.insert(0, DriftAlert("base_item_value", (category, item_key), 0.0, math.inf, rolls, detail))
+            config_alert = self._table_config_alert()
+            if config_alert is not None:
+                self.alerts.insert(0, config_alert)
+
+            previous = self._previous_signatures
+            self._previous_signatures = {alert.signature for alert in self.alerts}
+            self.new_alerts = [alert for alert in self.alerts if alert.signature not in previous]
+            self._reset_window()
+            return list(self.alerts)
+
+    def get_summary(self) -> str:
+        with self._lock:
+            lines = [f"Items generated: {self.items_seen}"]
+            for mode, count in self._mode_counts.items():
+                lines.append(f"  {mode}: {count}")
+            lines.append(f"Items since last check: {self._window_items}")
+
+            for (stage, group), counts in sorted(self._counts.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                total = sum(counts.values())
+                expected = self._expected_counts(stage, group)
+                group_name = f" ({', '.join(str(key) for key in group)})" if group else ""
+                lines.append(f"{STAGE_NAMES.get(stage, stage)}{group_name}: {total} rolls")
+                for key in sorted(set(counts) | set(expected), key=str):
+                    lines.append(
+                        f"  {key}: observed {counts.get(key, 0) / total:.3f}, expected {expected.get(key, 0.0) / total:.3f}"
+                    )
+
+            for stage, tally in self._tallies.items():
+                if tally.count:
+                    lines.append(
+                        f"{STAGE_NAMES[stage]}: observed mean {tally.observed / tally.count:.1f}, "
+                        f"expected {tally.expected / tally.count:.1f} over {tally.count} values"
+                    )
+
+            if self.alerts:
+                lines.append("Drift alerts from last check:")
+                lines.extend(f"  {alert}" for alert in self.alerts)
+            return "\n".join(lines)
@@ -1,11 +1,15 @@
 import random
 import json
 import os
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from drift_monitor import DriftMonitor
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 LOOT_TABLES_DIR = os.path.join(script_dir, 'loot_tables')
 DEFAULT_LOOT_TABLE = 'default.json'
+GENERATION_MODES = ["Full", "Force Normal Treasure", "Force Advanced Treasure", "Force Perishable", "Gem Type", "Monstrous Body Part Type"]
 
 
 # populate list of .json files to be used to populate the gradio dropdown.
@@ -62,16 +66,22 @@ class LootTable:
 
 
 class LootGenerator:
-    def __init__(self, loot_table_name: str, set_level: int):
+    def __init__(self, loot_table_name: str, set_level: int, monitor: Optional['DriftMonitor'] = None):
         self.loot_table = load_loot_tables(loot_table_name)
         self.set_level = set_level
         self.results_log: List[Dict[str, Any]] = []
+        # (stage, table group keys, matched key) for every table lookup, consumed by the optional drift monitor.
+        self.stage_outcomes: List[tuple[str, tuple, Optional[str]]] = []
+        self.monitor = monitor
 
     def _roll_and_log(self, die_size: int, description: str) -> int:
         roll = random.randint(1, die_size)
         self.results_log.append({"description": description, "roll": roll, "die_size": die_size})
         return roll
 
+    def _record_stage(self, stage: str, group: tuple, outcome: Optional[str]) -> None:
+        self.stage_outcomes.append((stage, group, outcome))
+
     def primary_treasure_roller(self) -> tuple[Union[LootTable, str], int]:
         primary_treasure_data = self.loot_table['loot_tables']['primary_treasure_roll']
         primary_treasure_types = primary_treasure_data['type']
@@ -96,8 +106,10 @@ class LootGenerator:
             max_val = loot_table_entry.max
 
             if min_val is not None and max_val is not None and min_val <= primary_roll <= max_val:
+                self._record_stage("primary", (), entry_key)
                 return loot_table_entry, primary_roll
 
+        self._record_stage("primary", (), None)
         return 'Roll outside expected range.', primary_roll
 
     def normal_treasure_roller(self, normal_treasure_data: Dict[str, Any]) -> int:
@@ -142,11 +154,13 @@ class LootGenerator:
             type_suffix = loot_table_entry.use_suffix
 
             if min_val is not None and max_val is not None and min_val <= advanced_roll <= max_val:
+                self._record_stage("advanced", (), entry_key)
                 return loot_table_entry, advanced_roll, type_die_size, type_prefix, type_suffix
 
+        self._record_stage("advanced", (), None)
         return 'Roll outside expected range.', advanced_roll, 0, False, False
 
-    def base_item_type_roller(self, type_die_size: int) -> tuple[Union[LootTable, str], int]:
+    def base_item_type_roller(self, type_die_size: int, advanced_key: Optional[str] = None) -> tuple[Union[LootTable, str], int]:
         base_item_type_data = self.loot_table['loot_tables']['base_item_type']
         base_item_type_types = base_item_type_data['type']
         # The following commented lines are placeholders for potential future use.
@@ -168,8 +182,10 @@ class LootGenerator:
             max_val = loot_table_entry.max
 
             if min_val is not None and max_val is not None and min_val <= base_item_type_roll <= max_val:
+                self._record_stage("item_type", (advanced_key,), entry_key)
                 return loot_table_entry, base_item_type_roll
 
+        self._record_stage("item_type", (advanced_key,), None)
         return 'Roll outside expected range.', base_item_type_roll
 
     def base_item_roller(self, item_type_result: LootTable) -> tuple[Union[LootTable, str], int]:
@@ -209,8 +225,10 @@ class LootGenerator:
                     "xp": loot_table_entry._raw_data.get('xp', 0),
                     "gp": loot_table_entry._raw_data.get('gp', 0)
                 })
+                self._record_stage("base_item", (base_item_category,), item_key)
                 return loot_table_entry, roll
 
+        self._record_stage("base_item", (base_item_category,), None)
         return 'Roll outside expected range.', roll
 
     def gem_type_roller(self) -> tuple[Union[LootTable, str], int]:
@@ -231,8 +249,10 @@ class LootGenerator:
             max_val = loot_table_entry.max
 
             if min_val is not None and max_val is not None and min_val <= roll <= max_val:
+                self._record_stage("gem", (), entry_key)
                 return loot_table_entry, roll
 
+        self._record_stage("gem", (), None)
         return 'Roll outside expected range.', roll
 
     def body_part_roller(self) -> tuple[Union[LootTable, str], int]:
@@ -253,8 +273,10 @@ class LootGenerator:
             max_val = loot_table_entry.max
 
             if min_val is not None and max_val is not None and min_val <= roll <= max_val:
+                self._record_stage("body_part", (), entry_key)
                 return loot_table_entry, roll
 
+        self._record_stage("body_part", (), None)
         return 'Roll outside expected range.', roll
 
     def affix_type_roller(self, adv_result: LootTable, item_type_result: LootTable) -> None:
@@ -268,6 +290,7 @@ class LootGenerator:
             current_mod = item_type_result.ps_mod
 
             final_affix_type = None
+            stage = f"{log_affix_type.lower()}_type"
 
             while True:
                 if current_die_size is None:
@@ -288,12 +311,15 @@ class LootGenerator:
                 })
 
                 chosen_type = None
-                for _, data in affix_type_roll_table.items():
+                chosen_key = None
+                for type_key, data in affix_type_roll_table.items():
                     if data['min'] <= modified_roll <= data['max']:
                         chosen_type = data
+                        chosen_key = type_key
                         break
 
                 if not chosen_type:
+                    self._record_stage(stage, (item_type_result.key,), None)
                     return
 
                 if chosen_type['name'].lower() == 'capricious':
@@ -302,6 +328,7 @@ class LootGenerator:
                     current_mod = chosen_type['add_level']
                 else:
                     final_affix_type = chosen_type
+                    self._record_stage(stage, (item_type_result.key,), chosen_key)
                     break
 
             # Correctly determine die_size and mod for AffixRoller
@@ -387,6 +414,11 @@ class LootGenerator:
 
 
     def generate(self, mode: str = "Full") -> None:
+        self._generate(mode)
+        if self.monitor is not None:
+            self.monitor.record(self, mode)
+
+    def _generate(self, mode: str) -> None:
         if mode == "Full":
             result, roll = self.primary_treasure_roller()
         elif mode == "Force Normal Treasure":
@@ -426,7 +458,7 @@ class LootGenerator:
                     if mode == "Force Perishable":
                         item_type_result = LootTable("perishables", self.loot_table['loot_tables']['base_item_type']['type']['perishables'])
                     else:
-                        item_type_result, item_type_roll = self.base_item_type_roller(type_die_size)
+                        item_type_result, item_type_roll = self.base_item_type_roller(type_die_size, adv_result.key)
 
                     if isinstance(item_type_result, LootTable):
                         self.results_log.append({"description": "Base Item Type", "value": item_type_result.name})
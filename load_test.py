@@ -0,0 +1,309 @@
+"""
+Concurrent load test for the Gradio app.
+
+Starts app.py on a local port from a temporary copy of the project, then drives the "Generate Loot!" and
+"Save To Log" events from many simulated clients at once, across every generation mode and loot table.
+Reports throughput, latency percentiles, error rates and how well the shared log file held up.
+
+Usage:
+    python load_test.py --clients 1,4,16 --requests 25
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Optional, Dict, Any, List
+
+# The load test must not reach the network. Each Client is also created with analytics_enabled=False;
+# these are set before gradio_client is imported as a second safeguard against telemetry.
+os.environ['GRADIO_ANALYTICS_ENABLED'] = 'False'
+os.environ['HF_HUB_DISABLE_TELEMETRY'] = '1'
+
+from gradio_client import Client
+
+import generator
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Files the app needs at runtime; copied so the load test never writes to the real logs directory.
+APP_FILES = ['app.py', 'generator.py', 'drift_monitor.py', 'gradio.css']
+APP_DIRS = ['loot_tables']
+
+GENERATE_API = "/generate_loot_wrapper"
+SAVE_API = "/save_to_log"
+LOG_HEADER = ['Item Name', 'Effects', 'XP', 'GP', 'Is Cursed']
+
+
+# Ask the OS for a port nobody is listening on.
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# Nearest-rank percentile of an already sorted list.
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class AppServer:
+    """
+    Runs app.py in a subprocess from a temporary copy of the project, bound to localhost only.
+    """
+
+    def __init__(self, port: int, startup_timeout: float):
+        self.port = port
+        self.startup_timeout = startup_timeout
+        self.url = f"http://127.0.0.1:{port}/"
+        self.work_dir = tempfile.mkdtemp(prefix='loot_load_test_')
+        self.log_file = os.path.join(self.work_dir, 'logs', 'treasure.csv')
+        self.server_output = os.path.join(self.work_dir, 'server_output.txt')
+        self._process: Optional[subprocess.Popen] = None
+        self._output_handle = None
+
+    def start(self) -> None:
+        for filename in APP_FILES:
+            shutil.copy2(os.path.join(script_dir, filename), self.work_dir)
+        for dirname in APP_DIRS:
+            shutil.copytree(os.path.join(script_dir, dirname), os.path.join(self.work_dir, dirname))
+        os.makedirs(os.path.join(self.work_dir, 'logs'), exist_ok=True)
+
+        env = dict(os.environ)
+        env.update({
+            'GRADIO_SERVER_NAME': '127.0.0.1',
+            'GRADIO_SERVER_PORT': str(self.port),
+            'GRADIO_ANALYTICS_ENABLED': 'False',
+            'PYTHONUNBUFFERED': '1',
+        })
+        self._output_handle = open(self.server_output, 'w', encoding='utf-8')
+        self._process = subprocess.Popen(
+            [sys.executable, 'app.py'],
+            cwd=self.work_dir,
+            env=env,
+            stdout=self._output_handle,
+            stderr=subprocess.STDOUT,
+        )
+        self._wait_until_ready()
+
+    def _wait_until_ready(self) -> None:
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"App exited with code {self._process.returncode}. Rerun with --keep-files to inspect {self.server_output}")
+            try:
+                with urllib.request.urlopen(self.url, timeout=2) as response:
+                    if response.status == 200:
+                        return
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.25)
+        self.stop()
+        raise RuntimeError(f"App did not start within {self.startup_timeout} seconds. Rerun with --keep-files to inspect {self.server_output}")
+
+    def reset_log(self) -> None:
+        if os.path.isfile(self.log_file):
+            os.remove(self.log_file)
+
+    def stop(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        if self._output_handle is not None:
+            self._output_handle.close()
+            self._output_handle = None
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+# The outcome of a single event call made by a simulated client.
+class CallResult:
+    def __init__(self, event: str, latency: float, ok: bool, error: Optional[str] = None, mode: Optional[str] = None):
+        self.event: str = event
+        self.latency: float = latency # Seconds from submitting the event to receiving its output
+        self.ok: bool = ok
+        self.error: Optional[str] = error
+        self.mode: Optional[str] = mode
+
+
+# One simulated browser session: connects, then clicks Generate (and sometimes Save) repeatedly.
+def run_client(url: str, requests_per_client: int, save_ratio: float, tables: List[str], seed: int,
+               start_barrier: threading.Barrier, results: List[CallResult], results_lock: threading.Lock) -> None:
+    rng = random.Random(seed)
+    local_results: List[CallResult] = []
+
+    try:
+        client = Client(url, verbose=False, analytics_enabled=False, download_files=False)
+    except Exception as e:
+        local_results.append(CallResult("connect", 0.0, False, f"{type(e).__name__}: {e}"))
+        client = None
+
+    start_barrier.wait()
+
+    if client is not None:
+        for i in range(requests_per_client):
+            # Walk through every mode/table combination so all of them get exercised even on short runs.
+            combo = seed + i
+            mode = generator.GENERATION_MODES[combo % len(generator.GENERATION_MODES)]
+            table = tables[(combo // len(generator.GENERATION_MODES)) % len(tables)]
+            level = rng.randint(1, 20)
+
+            start = time.perf_counter()
+            try:
+                _, _, csv_data = client.predict(table, level, mode, api_name=GENERATE_API)
+                local_results.append(CallResult("generate", time.perf_counter() - start, True, mode=mode))
+            except Exception as e:
+                local_results.append(CallResult("generate", time.perf_counter() - start, False, f"{type(e).__name__}: {e}", mode))
+                continue
+
+            if rng.random() < save_ratio:
+                start = time.perf_counter()
+                try:
+                    status = client.predict(csv_data, api_name=SAVE_API)
+                    ok = isinstance(status, str) and status.startswith("Successfully")
+                    local_results.append(CallResult("save", time.perf_counter() - start, ok, None if ok else status, mode))
+                except Exception as e:
+                    local_results.append(CallResult("save", time.perf_counter() - start, False, f"{type(e).__name__}: {e}", mode))
+
+        client.close()
+
+    with results_lock:
+        results.extend(local_results)
+
+
+# Read back the CSV log and check that every successful save produced exactly one well formed row.
+def inspect_log_file(log_file: str) -> Dict[str, Any]:
+    if not os.path.isfile(log_file):
+        return {'rows': 0, 'malformed_rows': 0, 'headers': 0}
+
+    rows = 0
+    malformed_rows = 0
+    headers = 0
+    with open(log_file, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if row == LOG_HEADER:
+                headers += 1
+            elif len(row) == len(LOG_HEADER):
+                rows += 1
+            else:
+                malformed_rows += 1
+    return {'rows': rows, 'malformed_rows': malformed_rows, 'headers': headers}
+
+
+# Run one concurrency level and return the collected call results and wall time.
+def run_level(server: AppServer, clients: int, requests_per_client: int, save_ratio: float,
+              tables: List[str], seed: int) -> tuple[List[CallResult], float]:
+    results: List[CallResult] = []
+    results_lock = threading.Lock()
+    # The main thread joins the barrier too, so the clock starts once every client is connected.
+    start_barrier = threading.Barrier(clients + 1)
+
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(server.url, requests_per_client, save_ratio, tables, seed + n * requests_per_client,
+                  start_barrier, results, results_lock),
+            daemon=True,
+        )
+        for n in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def format_latency_line(label: str, calls: List[CallResult]) -> str:
+    latencies = sorted(r.latency * 1000 for r in calls if r.ok)
+    errors = sum(1 for r in calls if not r.ok)
+    error_rate = errors / len(calls) * 100 if calls else 0.0
+    return (
+        f"  {label:<26} n={len(calls):<6} errors={errors} ({error_rate:.1f}%)  "
+        f"p50={percentile(latencies, 50):.1f}ms p90={percentile(latencies, 90):.1f}ms "
+        f"p99={percentile(latencies, 99):.1f}ms max={latencies[-1] if latencies else 0.0:.1f}ms"
+    )
+
+
+def format_report(clients: int, results: List[CallResult], elapsed: float, log_stats: Dict[str, Any]) -> str:
+    generate_calls = [r for r in results if r.event == "generate"]
+    save_calls = [r for r in results if r.event == "save"]
+    connect_errors = [r for r in results if r.event == "connect"]
+    completed = sum(1 for r in results if r.ok)
+
+    lines = [f"=== {clients} concurrent client{'s' if clients != 1 else ''} ==="]
+    lines.append(f"  Wall time: {elapsed:.2f}s, throughput: {completed / elapsed if elapsed else 0.0:.1f} events/s "
+                 f"({sum(1 for r in generate_calls if r.ok) / elapsed if elapsed else 0.0:.1f} generations/s)")
+    if connect_errors:
+        lines.append(f"  Failed to connect: {len(connect_errors)} client(s), e.g. {connect_errors[0].error}")
+    lines.append(format_latency_line("Generate Loot!", generate_calls))
+    for mode in generator.GENERATION_MODES:
+        lines.append(format_latency_line(f"  {mode}", [r for r in generate_calls if r.mode == mode]))
+    lines.append(format_latency_line("Save To Log", save_calls))
+
+    successful_saves = sum(1 for r in save_calls if r.ok)
+    lost_rows = successful_saves - log_stats['rows']
+    lines.append(
+        f"  Log file: {log_stats['rows']} rows for {successful_saves} successful saves, "
+        f"{lost_rows} lost, {log_stats['malformed_rows']} malformed, {log_stats['headers']} header row(s)"
+    )
+
+    error_samples = {r.error for r in results if not r.ok and r.error}
+    for error in list(error_samples)[:3]:
+        lines.append(f"  Error: {error}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load test for the loot generator Gradio app.")
+    parser.add_argument('--clients', default='1,4,16,32', help="Comma separated concurrency levels to run, e.g. 1,4,16")
+    parser.add_argument('--requests', type=int, default=24, help="Generate clicks per client at each level")
+    parser.add_argument('--save-ratio', type=float, default=0.5, help="Chance that a client clicks Save To Log after generating")
+    parser.add_argument('--tables', default=None, help="Comma separated loot tables to use (default: all in loot_tables)")
+    parser.add_argument('--port', type=int, default=None, help="Port for the app (default: any free port)")
+    parser.add_argument('--startup-timeout', type=float, default=60.0, help="Seconds to wait for the app to start")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the simulated clients' choices")
+    parser.add_argument('--keep-files', action='store_true', help="Keep the temporary app copy, server output and log file")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.clients.split(',') if level.strip()]
+    tables = args.tables.split(',') if args.tables else generator.get_available_loot_tables()
+
+    server = AppServer(args.port or find_free_port(), args.startup_timeout)
+    print(f"Starting app at {server.url} from {server.work_dir}")
+    try:
+        server.start()
+        for clients in levels:
+            server.reset_log()
+            results, elapsed = run_level(server, clients, args.requests, args.save_ratio, tables, args.seed)
+            print(format_report(clients, results, elapsed, inspect_log_file(server.log_file)))
+    finally:
+        server.stop()
+        if args.keep_files:
+            print(f"Server output and log file kept in {server.work_dir}")
+        else:
+            server.cleanup()
+
+
+if __name__ == '__main__':
+    main()